@@ -1,11 +1,24 @@
 import streamlit as st
+import ast
 import json
 import os
 import hashlib
+import hmac
 import math
 import re
+import sqlite3
+from collections import deque
 from datetime import datetime
-from typing import Tuple, Optional, List, Dict, Any
+from itertools import islice
+from typing import Tuple, Optional, Dict, Any, Deque, Callable, List
+
+from argon2 import PasswordHasher
+from argon2.exceptions import VerificationError, InvalidHashError
+
+try:
+    import orjson
+except ImportError:  # Fall back to the stdlib json module
+    orjson = None
 
 # ==================== CONFIGURATION ====================
 st.set_page_config(
@@ -15,10 +28,24 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+DB_FILE = "calculator.db"
+# Files used by earlier versions, imported into the database on first start
 USERS_FILE = "users.json"
 HISTORY_FILE = "histories.json"
 MAX_HISTORY = 100
 HISTORY_DISPLAY = 30
+HISTORY_VISIBLE = 5
+EVAL_CACHE_SIZE = 500
+
+# Argon2id parameters (encoded into every stored hash, so they can be raised later)
+PASSWORD_HASHER = PasswordHasher(time_cost=3, memory_cost=65536, parallelism=1)
+LEGACY_HASH_RE = re.compile(r'^[0-9a-f]{64}$')
+
+# Precompiled patterns used on every calculation / validation
+USERNAME_RE = re.compile(r'^[a-zA-Z0-9_]+$')
+# Single-pass rewrite: implicit multiplication points (2pi, 3(4), (2)3, (1)(2)) match
+# as empty strings; percentages capture the number and whether a factor follows
+PREPROCESS_RE = re.compile(r'(?<=\d)(?=[a-z(])|(?<=\))(?=[\d(])|(\d+(?:\.\d+)?)\s*%(?=([\d(])?)')
 
 # ==================== CUSTOM CSS ====================
 st.markdown("""
@@ -89,29 +116,33 @@ class CalculationEntry:
 
 # ==================== UTILITY FUNCTIONS ====================
 def hash_password(password: str) -> str:
-    """Hash password using SHA-256"""
-    return hashlib.sha256(password.encode("utf-8")).hexdigest()
+    """Hash password using Argon2id (salt and parameters are embedded in the result)"""
+    return PASSWORD_HASHER.hash(password)
+
+def verify_password(stored_hash: str, password: str) -> Tuple[bool, bool]:
+    """Verify password against stored hash, returning (valid, needs_rehash)"""
+    if LEGACY_HASH_RE.match(stored_hash):
+        # Unsalted SHA-256 from older versions; upgrade on successful login
+        legacy_hash = hashlib.sha256(password.encode("utf-8")).hexdigest()
+        return hmac.compare_digest(stored_hash, legacy_hash), True
+    try:
+        PASSWORD_HASHER.verify(stored_hash, password)
+    except (VerificationError, InvalidHashError):
+        return False, False
+    return True, PASSWORD_HASHER.check_needs_rehash(stored_hash)
 
-def load_json_file(path: str) -> Dict[str, Any]:
-    """Load JSON file with error handling"""
-    if os.path.exists(path):
-        try:
-            with open(path, "r", encoding="utf-8") as f:
-                return json.load(f)
-        except (json.JSONDecodeError, IOError) as e:
-            st.error(f"Error loading {path}: {str(e)}")
-            return {}
-    return {}
+def json_loads(raw: bytes) -> Any:
+    """Parse JSON bytes (using orjson when available)"""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
 
-def save_json_file(path: str, data: Dict[str, Any]) -> bool:
-    """Save JSON file with error handling"""
-    try:
-        with open(path, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
-        return True
-    except IOError as e:
-        st.error(f"Error saving {path}: {str(e)}")
-        return False
+def load_json_file(path: str) -> Dict[str, Any]:
+    """Load JSON file ({} if it doesn't exist; read and parse errors are raised)"""
+    if not os.path.exists(path):
+        return {}
+    with open(path, "rb") as f:
+        return json_loads(f.read())
 
 def validate_username(username: str) -> Tuple[bool, str]:
     """Validate username format"""
@@ -119,7 +150,7 @@ def validate_username(username: str) -> Tuple[bool, str]:
         return False, "Username must be at least 3 characters"
     if len(username) > 20:
         return False, "Username must be at most 20 characters"
-    if not re.match(r'^[a-zA-Z0-9_]+$', username):
+    if not USERNAME_RE.match(username):
         return False, "Username can only contain letters, numbers, and underscores"
     return True, ""
 
@@ -129,6 +160,70 @@ def validate_password(password: str) -> Tuple[bool, str]:
         return False, "Password must be at least 6 characters"
     return True, ""
 
+# ==================== DATABASE ====================
+@st.cache_resource
+def get_connection() -> sqlite3.Connection:
+    """Open the shared database (autocommit, WAL) and create the schema"""
+    conn = sqlite3.connect(DB_FILE, check_same_thread=False, isolation_level=None)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.executescript("""
+        CREATE TABLE IF NOT EXISTS users (
+            username TEXT PRIMARY KEY,
+            password TEXT NOT NULL,
+            created_at TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS history (
+            id INTEGER PRIMARY KEY,
+            username TEXT NOT NULL,
+            expr TEXT NOT NULL,
+            result TEXT NOT NULL,
+            timestamp TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS history_username ON history (username, id);
+    """)
+    if conn.execute("PRAGMA user_version").fetchone()[0] == 0:
+        try:
+            import_legacy_files(conn)
+        except sqlite3.Error:
+            # Nothing is cached, so every use retries the import and fails until it succeeds
+            conn.close()
+            raise
+    return conn
+
+def import_legacy_files(conn: sqlite3.Connection):
+    """Import users.json and histories.json from earlier versions (runs once; raises sqlite3.DatabaseError on failure)"""
+    # Failing (rather than continuing without the old accounts) keeps anyone from
+    # signing up under an existing username before the import has succeeded
+    try:
+        users = load_json_file(USERS_FILE)
+        histories = load_json_file(HISTORY_FILE)
+    except (json.JSONDecodeError, IOError) as e:
+        raise sqlite3.DatabaseError(f"Error importing existing users and history: {str(e)}") from e
+    
+    conn.execute("BEGIN")
+    try:
+        existing = {name for (name,) in conn.execute("SELECT username FROM users")}
+        imported = {name: info for name, info in users.items() if name not in existing}
+        conn.executemany(
+            "INSERT INTO users (username, password, created_at) VALUES (?, ?, ?)",
+            [(name, info["password"], info.get("created_at", "")) for name, info in imported.items()]
+        )
+        # Only attach history to the accounts imported above (never to a different
+        # account with the same name); entries were stored newest first, so insert
+        # oldest first so ids follow time
+        for username, entries in histories.items():
+            if username not in imported:
+                continue
+            conn.executemany(
+                "INSERT INTO history (username, expr, result, timestamp) VALUES (?, ?, ?, ?)",
+                [(username, e["expr"], e["result"], e["timestamp"]) for e in reversed(entries)]
+            )
+        conn.execute("PRAGMA user_version = 1")
+        conn.execute("COMMIT")
+    except (sqlite3.Error, KeyError, TypeError) as e:
+        conn.execute("ROLLBACK")
+        raise sqlite3.DatabaseError(f"Error importing existing users and history: {str(e)}") from e
+
 # ==================== USER MANAGEMENT ====================
 def create_user(username: str, password: str) -> Tuple[bool, str]:
     """Create a new user account"""
@@ -143,86 +238,133 @@ def create_user(username: str, password: str) -> Tuple[bool, str]:
     if not valid:
         return False, msg
     
-    users = load_json_file(USERS_FILE)
-    
-    if username in users:
-        return False, "Username already exists"
-    
     user = User(username, hash_password(password), datetime.utcnow().isoformat())
-    users[username] = user.to_dict()
-    
-    if save_json_file(USERS_FILE, users):
-        return True, "Account created successfully! You can now log in."
-    return False, "Error creating account"
+    try:
+        get_connection().execute(
+            "INSERT INTO users (username, password, created_at) VALUES (?, ?, ?)",
+            (user.username, user.password_hash, user.created_at)
+        )
+    except sqlite3.IntegrityError:
+        return False, "Username already exists"
+    except sqlite3.Error as e:
+        st.error(f"Database error: {str(e)}")
+        return False, "Error creating account"
+    return True, "Account created successfully! You can now log in."
 
 def authenticate_user(username: str, password: str) -> bool:
     """Authenticate user credentials"""
     username = username.strip()
-    users = load_json_file(USERS_FILE)
     
-    if username in users:
-        stored_hash = users[username].get("password")
-        return stored_hash == hash_password(password)
-    return False
+    try:
+        conn = get_connection()
+        row = conn.execute("SELECT password FROM users WHERE username = ?", (username,)).fetchone()
+        if row is None:
+            return False
+        
+        valid, needs_rehash = verify_password(row[0], password)
+        if valid and needs_rehash:
+            conn.execute("UPDATE users SET password = ? WHERE username = ?", (hash_password(password), username))
+        return valid
+    except sqlite3.Error as e:
+        st.error(f"Database error: {str(e)}")
+        return False
 
 # ==================== HISTORY MANAGEMENT ====================
-def load_history(username: str) -> List[Dict[str, str]]:
-    """Load calculation history for a user"""
-    histories = load_json_file(HISTORY_FILE)
-    return histories.get(username, [])
+def load_history(username: str) -> Deque[Dict[str, str]]:
+    """Load the most recent calculations for a user, newest first"""
+    try:
+        rows = get_connection().execute(
+            "SELECT expr, result, timestamp FROM history WHERE username = ? ORDER BY id DESC LIMIT ?",
+            (username, MAX_HISTORY)
+        ).fetchall()
+    except sqlite3.Error as e:
+        st.error(f"Error loading history: {str(e)}")
+        return deque(maxlen=MAX_HISTORY)
+    return deque(
+        ({"expr": expr, "result": result, "timestamp": timestamp} for expr, result, timestamp in rows),
+        maxlen=MAX_HISTORY
+    )
 
 def append_history(username: str, entry: CalculationEntry) -> bool:
     """Append calculation to user history"""
-    histories = load_json_file(HISTORY_FILE)
-    histories.setdefault(username, [])
-    histories[username].insert(0, entry.to_dict())
-    histories[username] = histories[username][:MAX_HISTORY]
-    return save_json_file(HISTORY_FILE, histories)
+    try:
+        get_connection().execute(
+            "INSERT INTO history (username, expr, result, timestamp) VALUES (?, ?, ?, ?)",
+            (username, entry.expr, entry.result, entry.timestamp)
+        )
+        return True
+    except sqlite3.Error as e:
+        st.error(f"Error saving history: {str(e)}")
+        return False
 
 def clear_history(username: str) -> bool:
     """Clear user's calculation history"""
-    histories = load_json_file(HISTORY_FILE)
-    if username in histories:
-        histories.pop(username)
-        return save_json_file(HISTORY_FILE, histories)
-    return True
+    try:
+        get_connection().execute("DELETE FROM history WHERE username = ?", (username,))
+        return True
+    except sqlite3.Error as e:
+        st.error(f"Error clearing history: {str(e)}")
+        return False
 
 # ==================== CALCULATOR ENGINE ====================
+# Evaluation namespace, built once since the math module never changes
+SAFE_NAMESPACE = {
+    '__builtins__': None,
+    'abs': abs,
+    'round': round,
+    'pow': pow,
+    'min': min,
+    'max': max,
+    **{attr: getattr(math, attr) for attr in dir(math) if not attr.startswith('_')},
+}
+
+# Syntax allowed in expressions: arithmetic, numbers, and names/calls from SAFE_NAMESPACE
+ALLOWED_NODES = (
+    ast.Expression, ast.BinOp, ast.UnaryOp, ast.Call, ast.keyword,
+    ast.Name, ast.Constant, ast.Load, ast.operator, ast.unaryop,
+)
+
+@st.cache_resource
+def get_eval_cache() -> Dict[str, Tuple[Optional[float], Optional[str]]]:
+    """Process-wide cache of evaluated expressions: processed text -> (result, error)"""
+    return {}
+
+def rewrite_expression_token(match: re.Match) -> str:
+    """Replacement for a PREPROCESS_RE match"""
+    number, followed_by_factor = match.groups()
+    if number is None:
+        # Implicit multiplication: 2pi -> 2*pi, 3(4) -> 3*(4)
+        return "*"
+    # Percentage: 50% -> (50/100), 50%2 -> (50/100)*2
+    return f"({number}/100)*" if followed_by_factor else f"({number}/100)"
+
 def preprocess_expression(expr: str) -> str:
     """Preprocess expression for evaluation"""
-    expr = expr.strip()
-    # Replace percentage
-    expr = re.sub(r'(\d+(?:\.\d+)?)\s*%', r'(\1/100)', expr)
-    # Handle implicit multiplication: 2pi -> 2*pi, 3(4) -> 3*(4)
-    expr = re.sub(r'(\d)([a-z])', r'\1*\2', expr)
-    expr = re.sub(r'(\d)\(', r'\1*(', expr)
-    expr = re.sub(r'\)(\d)', r')*\1', expr)
-    expr = re.sub(r'\)\(', r')*(', expr)
-    return expr
+    return PREPROCESS_RE.sub(rewrite_expression_token, expr.strip())
+
+def validate_expression(tree: ast.Expression) -> Tuple[bool, str]:
+    """Validate that a parsed expression only uses allowed syntax and names"""
+    for node in ast.walk(tree):
+        if not isinstance(node, ALLOWED_NODES):
+            return False, f"Unsupported syntax: {type(node).__name__}"
+        if isinstance(node, ast.Name) and (node.id.startswith('_') or node.id not in SAFE_NAMESPACE):
+            return False, f"Unknown function or variable: {node.id}"
+        if isinstance(node, ast.Call) and not isinstance(node.func, ast.Name):
+            return False, "Only named functions can be called"
+        if isinstance(node, ast.Constant) and not isinstance(node.value, (int, float)):
+            return False, f"Unsupported value: {node.value!r}"
+    return True, ""
 
-def safe_eval(expr: str) -> Tuple[Optional[float], Optional[str]]:
-    """Safely evaluate mathematical expression"""
+def evaluate_expression(processed: str) -> Tuple[Optional[float], Optional[str]]:
+    """Evaluate a preprocessed expression in the safe namespace"""
     try:
-        # Build safe namespace
-        safe_dict = {
-            '__builtins__': None,
-            'abs': abs,
-            'round': round,
-            'pow': pow,
-            'min': min,
-            'max': max,
-        }
-        
-        # Add math module functions
-        math_attrs = [attr for attr in dir(math) if not attr.startswith('_')]
-        for attr in math_attrs:
-            safe_dict[attr] = getattr(math, attr)
+        # Reject anything but arithmetic before it reaches eval
+        tree = ast.parse(processed, '<calc>', 'eval')
+        valid, msg = validate_expression(tree)
+        if not valid:
+            return None, msg
         
-        # Preprocess expression
-        processed = preprocess_expression(expr)
-        
-        # Evaluate
-        result = eval(processed, safe_dict, {})
+        result = eval(compile(tree, '<calc>', 'eval'), SAFE_NAMESPACE, {})
         
         # Format result
         if isinstance(result, (int, float)):
@@ -241,6 +383,21 @@ def safe_eval(expr: str) -> Tuple[Optional[float], Optional[str]]:
     except Exception as e:
         return None, f"Error: {str(e)}"
 
+def safe_eval(expr: str) -> Tuple[Optional[float], Optional[str]]:
+    """Safely evaluate mathematical expression"""
+    processed = preprocess_expression(expr)
+    
+    # The namespace only holds pure functions, so an expression always
+    # evaluates to the same outcome; reused expressions skip eval entirely
+    eval_cache = get_eval_cache()
+    outcome = eval_cache.get(processed)
+    if outcome is None:
+        outcome = evaluate_expression(processed)
+        if len(eval_cache) >= EVAL_CACHE_SIZE:
+            eval_cache.clear()
+        eval_cache[processed] = outcome
+    return outcome
+
 # ==================== SESSION STATE INITIALIZATION ====================
 def init_session_state():
     """Initialize session state variables"""
@@ -248,7 +405,7 @@ def init_session_state():
         'user': None,
         'expr': '',
         'last_result': None,
-        'history': [],
+        'history': deque(maxlen=MAX_HISTORY),
         'memory': 0,
         'show_advanced': False
     }
@@ -291,6 +448,61 @@ def memory_subtract():
     if st.session_state.last_result is not None:
         st.session_state.memory -= st.session_state.last_result
 
+# ==================== BUTTON LAYOUT ====================
+# Each button is (key, label, callback, args), built once instead of per rerun
+ButtonSpec = Tuple[str, str, Callable, tuple]
+
+KEYPAD_ACTIONS = {
+    "C": (clear_expr, ()),
+    "⌫": (backspace, ()),
+    "MC": (clear_memory, ()),
+    "MR": (add_memory, ()),
+    "÷": (append_to_expr, ("/",)),
+    "×": (append_to_expr, ("*",)),
+    "^": (append_to_expr, ("**",)),
+}
+FUNCTION_INSERTS = {"ln": "log("}
+CALL_FUNCTIONS = {"sin", "cos", "tan", "asin", "acos", "atan", "log", "sqrt", "floor", "ceil", "abs", "degrees", "factorial"}
+
+def get_keypad_action(label: str) -> Tuple[Callable, tuple]:
+    """Get callback and args for a basic keypad button"""
+    return KEYPAD_ACTIONS.get(label, (append_to_expr, (label,)))
+
+def get_function_action(func: str) -> Tuple[Callable, tuple]:
+    """Get callback and args for an advanced function button"""
+    if func in FUNCTION_INSERTS:
+        return append_to_expr, (FUNCTION_INSERTS[func],)
+    if func in CALL_FUNCTIONS:
+        return append_to_expr, (f"{func}(",)
+    return append_to_expr, (func,)
+
+def build_button_grid(layout: List[List[str]], key_prefix: str, get_action: Callable) -> List[List[ButtonSpec]]:
+    """Precompute key, label and action for every button in a grid"""
+    return [
+        [(f"{key_prefix}_{row_idx}_{col_idx}_{label}", label, *get_action(label)) for col_idx, label in enumerate(row)]
+        for row_idx, row in enumerate(layout)
+    ]
+
+BASIC_BUTTONS = build_button_grid([
+    ["MC", "MR", "C", "⌫"],
+    ["7", "8", "9", "/", "sqrt"],
+    ["4", "5", "6", "*", "^"],
+    ["1", "2", "3", "-", "("],
+    ["0", ".", "%", "+", ")"],
+], "btn", get_keypad_action)
+
+ADVANCED_BUTTONS = build_button_grid([
+    ["sin", "cos", "tan", "pi", "e"],
+    ["asin", "acos", "atan", "log", "ln"],
+    ["floor", "ceil", "abs", "factorial", "degrees"]
+], "adv_btn", get_function_action)
+
+def render_button_grid(grid: List[List[ButtonSpec]]):
+    """Render a precomputed button grid"""
+    for row in grid:
+        for col, (key, label, callback, args) in zip(st.columns(len(row)), row):
+            col.button(label, on_click=callback, args=args, use_container_width=True, key=key)
+
 # ==================== SIDEBAR: AUTHENTICATION ====================
 st.sidebar.title("👤 Account")
 
@@ -324,7 +536,7 @@ if not st.session_state.user:
         if st.sidebar.button("Continue as Guest", use_container_width=True):
             guest_id = datetime.utcnow().strftime("guest_%Y%m%d_%H%M%S")
             st.session_state.user = guest_id
-            st.session_state.history = []
+            st.session_state.history = deque(maxlen=MAX_HISTORY)
             st.rerun()
 
 else:
@@ -332,7 +544,7 @@ else:
     
     if st.sidebar.button("🚪 Logout", use_container_width=True):
         for key in ['user', 'expr', 'last_result', 'history', 'memory']:
-            st.session_state[key] = None if key == 'user' else ([] if key == 'history' else (0 if key == 'memory' else ''))
+            st.session_state[key] = None if key == 'user' else (deque(maxlen=MAX_HISTORY) if key == 'history' else (0 if key == 'memory' else ''))
         st.rerun()
     
     st.sidebar.divider()
@@ -378,58 +590,12 @@ with calc_col:
     st.markdown(f'<div class="calculator-display">{display_text}</div>', unsafe_allow_html=True)
     
     # Button grid - FIXED with unique keys and proper symbols
-    button_layout = [
-        ["MC", "MR", "C", "⌫"],
-        ["7", "8", "9", "/", "sqrt"],
-        ["4", "5", "6", "*", "^"],
-        ["1", "2", "3", "-", "("],
-        ["0", ".", "%", "+", ")"],
-    ]
-    
-    for row_idx, row in enumerate(button_layout):
-        cols = st.columns(len(row))
-        for col_idx, (col, btn) in enumerate(zip(cols, row)):
-            btn_key = f"btn_{row_idx}_{col_idx}_{btn}"
-            
-            if btn == "C":
-                col.button(btn, on_click=clear_expr, use_container_width=True, key=btn_key)
-            elif btn == "⌫":
-                col.button(btn, on_click=backspace, use_container_width=True, key=btn_key)
-            elif btn == "MC":
-                col.button(btn, on_click=clear_memory, use_container_width=True, key=btn_key)
-            elif btn == "MR":
-                col.button(btn, on_click=add_memory, use_container_width=True, key=btn_key)
-            elif btn == "÷":
-                col.button(btn, on_click=append_to_expr, args=("/",), use_container_width=True, key=btn_key)
-            elif btn == "×":
-                col.button(btn, on_click=append_to_expr, args=("*",), use_container_width=True, key=btn_key)
-            elif btn == "^":
-                col.button(btn, on_click=append_to_expr, args=("**",), use_container_width=True, key=btn_key)
-            else:
-                col.button(btn, on_click=append_to_expr, args=(btn,), use_container_width=True, key=btn_key)
+    render_button_grid(BASIC_BUTTONS)
     
     # Advanced functions toggle
     if st.checkbox("Show Advanced Functions", value=st.session_state.show_advanced, key="adv_checkbox"):
         st.session_state.show_advanced = True
-        adv_functions = [
-            ["sin", "cos", "tan", "pi", "e"],
-            ["asin", "acos", "atan", "log", "ln"],
-            ["floor", "ceil", "abs", "factorial", "degrees"]
-        ]
-        
-        for row_idx, row in enumerate(adv_functions):
-            cols = st.columns(len(row))
-            for col_idx, (col, func) in enumerate(zip(cols, row)):
-                func_key = f"adv_btn_{row_idx}_{col_idx}_{func}"
-                
-                if func == "ln":
-                    col.button(func, on_click=append_to_expr, args=("log(",), use_container_width=True, key=func_key)
-                elif func == "factorial":
-                    col.button(func, on_click=append_to_expr, args=("factorial(",), use_container_width=True, key=func_key)
-                elif func in ["sin", "cos", "tan", "asin", "acos", "atan", "log", "sqrt", "floor", "ceil", "abs", "degrees"]:
-                    col.button(func, on_click=append_to_expr, args=(f"{func}(",), use_container_width=True, key=func_key)
-                else:
-                    col.button(func, on_click=append_to_expr, args=(func,), use_container_width=True, key=func_key)
+        render_button_grid(ADVANCED_BUTTONS)
     else:
         st.session_state.show_advanced = False
     
@@ -452,8 +618,8 @@ with calc_col:
                     str(result),
                     datetime.utcnow().isoformat()
                 )
-                append_history(st.session_state.user, entry)
-                st.session_state.history = load_history(st.session_state.user)
+                if append_history(st.session_state.user, entry):
+                    st.session_state.history.appendleft(entry.to_dict())
                 
                 # Update expression with result
                 st.session_state.expr = str(result)
@@ -462,28 +628,48 @@ with calc_col:
 with hist_col:
     st.subheader("📜 History")
     
-    history = load_history(st.session_state.user)
+    # Kept in sync at login, after Calculate and on Clear History
+    history = st.session_state.history
+    
+    def render_history_item(idx: int, item: Dict[str, str]):
+        """Render a history entry with its Reuse button"""
+        timestamp = item.get("timestamp", "")[:19].replace("T", " ")
+        with st.container():
+            st.markdown(f"**{item['expr']}**")
+            st.markdown(f"= `{item['result']}`")
+            st.caption(f"🕒 {timestamp}")
+            
+            # Reuse button
+            if st.button(f"↻ Reuse", key=f"reuse_{idx}"):
+                st.session_state.expr = item['expr']
+                st.rerun()
+            
+            st.divider()
     
     if history:
-        st.caption(f"Showing {min(HISTORY_DISPLAY, len(history))} of {len(history)} calculations")
+        # Only the newest occurrence of a repeated expression is shown
+        seen = set()
+        entries = []
+        for idx, item in enumerate(islice(history, HISTORY_DISPLAY)):
+            if item['expr'] not in seen:
+                seen.add(item['expr'])
+                entries.append((idx, item))
         
-        for idx, item in enumerate(history[:HISTORY_DISPLAY]):
-            timestamp = item.get("timestamp", "")[:19].replace("T", " ")
-            with st.container():
-                st.markdown(f"**{item['expr']}**")
-                st.markdown(f"= `{item['result']}`")
-                st.caption(f"🕒 {timestamp}")
-                
-                # Reuse button
-                if st.button(f"↻ Reuse", key=f"reuse_{idx}"):
-                    st.session_state.expr = item['expr']
-                    st.rerun()
-                
-                st.divider()
+        st.caption(f"Showing {len(entries)} of {len(history)} calculations")
+        
+        # Most recent entries inline, the rest collapsed
+        for idx, item in entries[:HISTORY_VISIBLE]:
+            render_history_item(idx, item)
+        
+        older = entries[HISTORY_VISIBLE:]
+        if older:
+            with st.expander(f"Older ({len(older)})"):
+                for idx, item in older:
+                    render_history_item(idx, item)
         
         if st.button("🗑️ Clear History", use_container_width=True, key="clear_history_btn"):
             if clear_history(st.session_state.user):
-                st.session_state.history = []
+                st.session_state.history = deque(maxlen=MAX_HISTORY)
                 st.rerun()
     else:
         st.info("No calculations yet. Start calculating to build your history!")
@@ -1,9 +1,9 @@
 import streamlit as st
 import joblib
 import string
-import random
+import secrets
 from datetime import datetime
-import pandas as pd
+import numpy as np
 
 # Page configuration
 st.set_page_config(
@@ -109,7 +109,7 @@ if page == "🔑 Password Generator":
             st.error("❌ Please select at least one character type!")
         else:
             # Generate password
-            password = ''.join(random.choice(char_pool) for _ in range(password_length))
+            password = ''.join(secrets.choice(char_pool) for _ in range(password_length))
             
             st.markdown("---")
             st.subheader("✅ Generated Password")
@@ -206,7 +206,15 @@ st.markdown("Enter the pollutant concentrations below to predict the air quality
 
 # Define the feature columns
 columns = ['PM2.5', 'PM10', 'NO', 'NO2', 'NOx', 'NH3', 'CO', 'SO2', 'O3', 'Benzene', 'Toluene', 'Xylene']
-data = []
+
+# AQI quality buckets: upper bound (inclusive) of each level but the last
+aqi_thresholds = np.array([50, 100, 200, 300])
+aqi_quality_labels = np.array(['Good', 'Satisfactory', 'Moderate', 'Poor', 'Very Poor'])
+
+def get_aqi_quality(aqi):
+    # Accepts a single AQI value or an array of them (one vectorized lookup, no branches)
+    quality = aqi_quality_labels[np.searchsorted(aqi_thresholds, aqi)]
+    return quality if np.ndim(quality) else str(quality)
 
 # Input form for better UX
 with st.form("input_form"):
@@ -225,27 +233,18 @@ with st.form("input_form"):
 
 if submitted:
     try:
-        # Convert inputs to DataFrame
-        data = pd.DataFrame([list(inputs.values())], columns=columns)
+        # Cached model shared with the Model Loader page (any other load error is reported below)
+        model, success = load_model()
+        if not success:
+            st.error("❌ Could not load model-rt.pkl")
+            st.stop()
+
+        # Convert inputs to a single feature row (same order as columns)
+        data = np.fromiter(inputs.values(), dtype=np.float64, count=len(columns)).reshape(1, -1)
 
-        # Load model
-        model = joblib.load('model-rt.pkl')
         prediction = model.predict(data)[0]  # Get scalar value
 
         # AQI quality determination
-        aqi_quality_labels = ['Good', 'Satisfactory', 'Moderate', 'Poor', 'Very Poor']
-        def get_aqi_quality(aqi):
-            if aqi <= 50:
-                return aqi_quality_labels[0]
-            elif aqi <= 100:
-                return aqi_quality_labels[1]
-            elif aqi <= 200:
-                return aqi_quality_labels[2]
-            elif aqi <= 300:
-                return aqi_quality_labels[3]
-            else:
-                return aqi_quality_labels[4]
-
         air_quality = get_aqi_quality(prediction)
 
         # Display result
@@ -1,131 +1,395 @@
 import streamlit as st
-from datetime import datetime
+import pandas as pd
+from datetime import date, datetime
 import json
+import os
+import mmap
+import bisect
+import threading
+
+try:
+    import orjson
+except ImportError:  # Fall back to the stdlib json module
+    orjson = None
 
 # Page configuration
 st.set_page_config(page_title="To-Do List", page_icon="✅", layout="centered")
 
-# Initialize session state for tasks
-if 'tasks' not in st.session_state:
-    st.session_state.tasks = []
+TASKS_FILE = 'tasks.json'
+
+# Sort rank stored on each task as 'priority_rank' (High first, no priority last)
+PRIORITY_RANKS = {"High": 0, "Medium": 1, "Low": 2, None: 3}
+
+# Due date ordinal used when sorting tasks without a due date (sorts them last)
+NO_DUE_DATE = date.max.toordinal()
+
+# Sort key per sort option; ties fall back to the id, i.e. creation order
+SORT_KEYS = {
+    "Priority (High to Low)": lambda t: (t['priority_rank'], t['id']),
+    "Due Date": lambda t: (t['due_date_ord'] or NO_DUE_DATE, t['id']),
+    "Alphabetical": lambda t: (t['task_lower'], t['id'])
+}
+
+# Fields computed from the others on load; never written to disk or exported
+DERIVED_FIELDS = ('task_lower', 'due_date_ord', 'priority_rank')
+
+# Parse the tasks file; orjson parses straight from a memory map, without a bytes copy
+def read_tasks_file(path):
+    with open(path, 'rb') as f:
+        if not orjson or os.fstat(f.fileno()).st_size == 0:  # mmap can't map an empty file
+            data = f.read()
+            return orjson.loads(data) if orjson else json.loads(data)
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            with memoryview(mm) as view:
+                return orjson.loads(view)
+
+# Next unused task id (ids only ever increase, so they also follow creation order)
+def next_task_id(tasks):
+    return max((t['id'] for t in tasks if 'id' in t), default=-1) + 1
+
+# Add ids missing from tasks saved by older versions and compute the derived fields
+def upgrade_tasks(tasks):
+    new_id = next_task_id(tasks)
+    for task in tasks:
+        if 'id' not in task:
+            task['id'] = new_id
+            new_id += 1
+        task['task_lower'] = task['task'].lower()
+        task['due_date_ord'] = datetime.strptime(task['due_date'], "%Y-%m-%d").toordinal() if task.get('due_date') else None
+        task['priority_rank'] = PRIORITY_RANKS.get(task.get('priority'), 3)
+    return tasks
 
-# Load tasks from file (persistence)
-def load_tasks():
+# Task list shared by every session; the file is only parsed once per process.
+# Mutate it in place (never reassign) so all sessions keep seeing the same list
+@st.cache_resource
+def get_task_store():
     try:
-        with open('tasks.json', 'r') as f:
-            st.session_state.tasks = json.load(f)
+        return upgrade_tasks(read_tasks_file(TASKS_FILE))
     except FileNotFoundError:
-        st.session_state.tasks = []
+        return []
 
-# Save tasks to file
+# Lock guarding changes to the shared task list and writes to the tasks file
+@st.cache_resource
+def get_task_lock():
+    return threading.Lock()
+
+# Serialize tasks to compact JSON bytes, leaving out the derived fields
+def dump_tasks(tasks):
+    stored = [{k: v for k, v in t.items() if k not in DERIVED_FIELDS} for t in tasks]
+    return orjson.dumps(stored) if orjson else json.dumps(stored).encode('utf-8')
+
+# Save tasks to file (via a temp file + rename so a failed write can't truncate it)
 def save_tasks():
-    with open('tasks.json', 'w') as f:
-        json.dump(st.session_state.tasks, f)
-
-# Load tasks on startup
-if len(st.session_state.tasks) == 0:
-    load_tasks()
-
-# App title with custom styling
-st.markdown("""
-    <style>
-    .big-font {
-        font-size:40px !important;
-        font-weight: bold;
-        color: #1f77b4;
-    }
-    </style>
-    """, unsafe_allow_html=True)
+    tmp_path = TASKS_FILE + '.tmp'
+    with get_task_lock():
+        with open(tmp_path, 'wb') as f:
+            f.write(dump_tasks(st.session_state.tasks))
+        os.replace(tmp_path, TASKS_FILE)
+    st.session_state.tasks_dirty = False
 
-st.title("✅ My To-Do List")
-st.markdown("*Stay organized and productive!*")
-st.markdown("---")
+# Record that tasks changed; the write happens once in flush_tasks()
+def mark_dirty():
+    st.session_state.tasks_dirty = True
 
-# Sidebar for additional features
-with st.sidebar:
-    st.header("⚙️ Settings")
-    
-    # Priority levels
-    show_priority = st.checkbox("Enable Priority Levels", value=False)
-    
-    # Due dates
-    show_due_date = st.checkbox("Enable Due Dates", value=False)
+# Write all pending changes in a single save
+def flush_tasks():
+    if st.session_state.get('tasks_dirty'):
+        save_tasks()
+
+# Completed/overdue totals for the shared task list, updated by every change
+# so the statistics don't rescan the list. Callers hold the task lock
+@st.cache_resource
+def get_task_counts():
+    return {'day': None, 'completed': 0, 'overdue': 0}
+
+# Recount from scratch (on first use, and when the date changes since tasks become overdue)
+def recount_tasks(today_ord):
+    completed = 0
+    overdue = 0
+    for t in st.session_state.tasks:
+        if t['completed']:
+            completed += 1
+        elif t['due_date_ord'] and t['due_date_ord'] < today_ord:
+            overdue += 1
+    get_task_counts().update(day=today_ord, completed=completed, overdue=overdue)
+
+# Add (sign=1) or remove (sign=-1) one task's contribution to the counters
+def count_task(task, sign):
+    counts = get_task_counts()
+    if task['completed']:
+        counts['completed'] += sign
+    elif task['due_date_ord'] and task['due_date_ord'] < counts['day']:
+        counts['overdue'] += sign
+
+# Sort keys of all tasks, presorted once per sort option
+def build_task_orders(tasks):
+    return {option: sorted(map(key, tasks)) for option, key in SORT_KEYS.items()}
+
+# Presorted orders for the shared task list, kept sorted by insort/removal on
+# each change so showing a sorted view never sorts. Callers hold the task lock
+@st.cache_resource
+def get_task_orders():
+    return build_task_orders(get_task_store())
+
+# Insert a new task into every presorted order
+def add_to_orders(task):
+    orders = get_task_orders()
+    for option, key in SORT_KEYS.items():
+        bisect.insort(orders[option], key(task))
+
+# Remove a task from every presorted order
+def remove_from_orders(task):
+    orders = get_task_orders()
+    for option, key in SORT_KEYS.items():
+        order = orders[option]
+        del order[bisect.bisect_left(order, key(task))]
+
+# Filter tasks, returning the positions of the tasks to display in the given order.
+# Takes one tuple per task field so st.cache_data can hash them; reruns with
+# unchanged tasks and widget values skip the work
+@st.cache_data(max_entries=50)
+def compute_view(order, completed, priority_ranks, names, filter_option, priority_filter, search_query):
+    query = search_query.lower() if search_query else None
+    wanted_rank = PRIORITY_RANKS[priority_filter] if priority_filter != "All" else None
     
-    # Categories
-    show_categories = st.checkbox("Enable Categories", value=False)
+    # Completion, priority and search filters in one pass, cheapest checks first
+    def keep(i):
+        if filter_option == "Active" and completed[i]:
+            return False
+        if filter_option == "Completed" and not completed[i]:
+            return False
+        if wanted_rank is not None and priority_ranks[i] != wanted_rank:
+            return False
+        if query and query not in names[i]:
+            return False
+        return True
     
-    st.markdown("---")
-    st.header("📥 Import/Export")
+    return [i for i in order if keep(i)]
+
+# Build the table for the table view, indexed by task id
+@st.cache_data(max_entries=50)
+def build_task_frame(ids, completed, names, priorities, due_dates, categories):
+    return pd.DataFrame(
+        {'Done': completed, 'Task': names, 'Priority': priorities, 'Due': due_dates, 'Category': categories},
+        index=pd.Index(ids, name='id')
+    )
+
+# Apply completions and deletions made in the table view, matched by task id
+# (the table can't add rows; new tasks come from the form above)
+def apply_table_edits(frame, edited):
+    kept = edited.index.intersection(frame.index)
+    deleted = set(frame.index.difference(edited.index).tolist())
+    done = edited.loc[kept, 'Done']
+    changed = done[done != frame.loc[kept, 'Done']].to_dict()
+    if not changed and not deleted:
+        return
     
-    # Export tasks
+    with get_task_lock():
+        tasks = st.session_state.tasks
+        for t in tasks:
+            if t['id'] in changed:
+                count_task(t, -1)
+                t['completed'] = bool(changed[t['id']])
+                count_task(t, 1)
+            elif t['id'] in deleted:
+                count_task(t, -1)
+                remove_from_orders(t)
+        if deleted:
+            tasks[:] = [t for t in tasks if t['id'] not in deleted]
+    mark_dirty()
+    st.rerun()
+
+# Attach this session to the shared task list
+st.session_state.tasks = get_task_store()
+
+# Persist changes from the previous run
+flush_tasks()
+
+# Today's date as an ordinal, compared against each task's 'due_date_ord'
+today_ord = datetime.now().date().toordinal()
+if get_task_counts()['day'] != today_ord:
+    with get_task_lock():
+        recount_tasks(today_ord)
+
+# Export button; as a fragment, clicking it reruns only this part of the sidebar
+@st.fragment
+def render_export():
     if st.button("Export Tasks", use_container_width=True):
         if st.session_state.tasks:
-            json_str = json.dumps(st.session_state.tasks, indent=2)
             st.download_button(
                 label="Download JSON",
-                data=json_str,
+                data=dump_tasks(st.session_state.tasks),
                 file_name=f"tasks_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json",
                 mime="application/json"
             )
         else:
             st.warning("No tasks to export!")
-    
-    # Clear all tasks
-    st.markdown("---")
-    if st.button("🗑️ Clear All Tasks", type="secondary", use_container_width=True):
-        if st.session_state.tasks:
-            st.session_state.tasks = []
-            save_tasks()
-            st.rerun()
 
-# Input section with enhanced features
-col1, col2 = st.columns([3, 1])
-
-with col1:
-    new_task = st.text_input("Add a new task", placeholder="Enter your task here...", label_visibility="collapsed")
+# Input section; as a fragment, typing and picking options reruns only the form
+@st.fragment
+def render_add_form(show_priority, show_due_date, show_categories):
+    col1, col2 = st.columns([3, 1])
+    
+    with col1:
+        new_task = st.text_input("Add a new task", placeholder="Enter your task here...", label_visibility="collapsed")
+    
+    # Optional fields based on settings
+    priority_level = None
+    due_date = None
+    category = None
+    
+    if show_priority or show_due_date or show_categories:
+        cols = st.columns(3)
+        
+        if show_priority:
+            with cols[0]:
+                priority_level = st.selectbox("Priority", ["Low", "Medium", "High"], key="priority_select")
+        
+        if show_due_date:
+            with cols[1]:
+                due_date = st.date_input("Due Date", key="due_date_select")
+        
+        if show_categories:
+            with cols[2]:
+                category = st.selectbox("Category", ["Personal", "Work", "Shopping", "Health", "Other"], key="category_select")
+    
+    with col2:
+        if st.button("Add Task", type="primary", use_container_width=True):
+            if new_task.strip():
+                with get_task_lock():
+                    task_item = {
+                        'id': next_task_id(st.session_state.tasks),
+                        'task': new_task,
+                        'task_lower': new_task.lower(),
+                        'completed': False,
+                        'created_at': datetime.now().strftime("%Y-%m-%d %H:%M"),
+                        'priority': priority_level if show_priority else None,
+                        'priority_rank': PRIORITY_RANKS[priority_level if show_priority else None],
+                        'due_date': due_date.strftime("%Y-%m-%d") if show_due_date and due_date else None,
+                        'due_date_ord': due_date.toordinal() if show_due_date and due_date else None,
+                        'category': category if show_categories else None
+                    }
+                    add_to_orders(task_item)
+                    st.session_state.tasks.append(task_item)
+                    count_task(task_item, 1)
+                mark_dirty()
+                st.rerun()  # Full rerun: the task list and statistics change
 
-# Optional fields based on settings
-priority_level = None
-due_date = None
-category = None
+# Render one task row; as a fragment, toggling its checkbox reruns only this row
+@st.fragment
+def render_task_row(idx, task_id, today_ord):
+    tasks = st.session_state.tasks
+    if idx >= len(tasks) or tasks[idx]['id'] != task_id:
+        st.rerun()  # Another session changed the shared list; redraw every row
+    task = tasks[idx]
+    
+    col1, col2, col3 = st.columns([0.5, 3, 0.5])
+    
+    with col1:
+        # Checkbox for completion
+        checked = st.checkbox("", value=task['completed'], key=f"check_{task['id']}", label_visibility="collapsed")
+        if checked != task['completed']:
+            # Only this row reruns, so save now rather than at the start of the next full run
+            with get_task_lock():
+                count_task(task, -1)
+                task['completed'] = checked
+                count_task(task, 1)
+            mark_dirty()
+            flush_tasks()
+    
+    with col2:
+        # Priority indicator
+        priority_emoji = ""
+        if task.get('priority') == "High":
+            priority_emoji = "🔴"
+        elif task.get('priority') == "Medium":
+            priority_emoji = "🟡"
+        elif task.get('priority') == "Low":
+            priority_emoji = "🟢"
+        
+        # Display task with strikethrough if completed
+        if task['completed']:
+            st.markdown(f"~~{priority_emoji} {task['task']}~~ ✓")
+        else:
+            st.markdown(f"**{priority_emoji} {task['task']}**")
+        
+        # Display metadata (parts joined once instead of concatenated)
+        parts = [f"Created: {task['created_at']}"]
+        due_ord = task['due_date_ord']
+        if due_ord:
+            if due_ord < today_ord and not task['completed']:
+                parts.append(f" | 🔴 Due: {task['due_date']} (Overdue!)")
+            else:
+                parts.append(f" | 📅 Due: {task['due_date']}")
+        category = task.get('category')
+        if category:
+            parts.append(f" | 🏷️ {category}")
+        
+        st.caption("".join(parts))
+    
+    with col3:
+        # Delete button
+        if st.button("🗑️", key=f"del_{task['id']}"):
+            with get_task_lock():
+                count_task(task, -1)
+                remove_from_orders(task)
+                tasks[:] = [t for t in tasks if t['id'] != task['id']]
+            mark_dirty()
+            st.rerun()  # Full rerun: positions of the rows below have shifted
+    
+    st.markdown("---")
 
-if show_priority or show_due_date or show_categories:
-    cols = st.columns(3)
+# Task statistics (from the running counters)
+def render_stats(show_due_date):
+    tasks = st.session_state.tasks
+    counts = get_task_counts()
+    total = len(tasks)
+    completed = counts['completed']
+    overdue = counts['overdue']
+    active = total - completed
     
-    if show_priority:
-        with cols[0]:
-            priority_level = st.selectbox("Priority", ["Low", "Medium", "High"], key="priority_select")
+    st.markdown("### 📊 Statistics")
     
     if show_due_date:
-        with cols[1]:
-            due_date = st.date_input("Due Date", key="due_date_select")
-    
-    if show_categories:
-        with cols[2]:
-            category = st.selectbox("Category", ["Personal", "Work", "Shopping", "Health", "Other"], key="category_select")
-
-with col2:
-    if st.button("Add Task", type="primary", use_container_width=True):
-        if new_task.strip():
-            task_item = {
-                'task': new_task,
-                'completed': False,
-                'created_at': datetime.now().strftime("%Y-%m-%d %H:%M"),
-                'priority': priority_level if show_priority else None,
-                'due_date': due_date.strftime("%Y-%m-%d") if show_due_date and due_date else None,
-                'category': category if show_categories else None
-            }
-            st.session_state.tasks.append(task_item)
-            save_tasks()
+        col1, col2, col3, col4 = st.columns(4)
+        col1.metric("Total Tasks", total)
+        col2.metric("Active", active)
+        col3.metric("Completed", completed)
+        col4.metric("Overdue", overdue, delta_color="inverse")
+    else:
+        col1, col2, col3 = st.columns(3)
+        col1.metric("Total Tasks", total)
+        col2.metric("Active", active)
+        col3.metric("Completed", completed)
+    
+    # Progress bar
+    if total > 0:
+        progress = completed / total
+        st.progress(progress)
+        st.caption(f"Progress: {completed}/{total} tasks completed ({progress*100:.1f}%)")
+    
+    # Clear completed button
+    if completed > 0:
+        if st.button("Clear Completed Tasks", type="secondary"):
+            with get_task_lock():
+                tasks[:] = [t for t in tasks if not t['completed']]
+                get_task_counts()['completed'] = 0
+                get_task_orders().update(build_task_orders(tasks))
+            mark_dirty()
             st.rerun()
 
-st.markdown("---")
-
-# Search functionality
-search_query = st.text_input("🔍 Search tasks", placeholder="Search by task name...")
-
-# Display tasks
-if st.session_state.tasks:
+# Search, filters, tasks and statistics; as a fragment, changing the search,
+# filter or sort reruns only the list
+@st.fragment
+def render_task_list(show_priority, show_due_date, show_categories, table_view, today_ord):
+    # Search functionality
+    search_query = st.text_input("🔍 Search tasks", placeholder="Search by task name...")
+    
+    tasks = st.session_state.tasks
+    if not tasks:
+        st.info("No tasks yet. Add your first task above! 🎯")
+        return
+    
     # Filter options
     col1, col2 = st.columns([2, 1])
     
@@ -145,125 +409,110 @@ if st.session_state.tasks:
     # Sort options
     sort_option = st.selectbox("Sort by:", ["Created Date", "Priority (High to Low)", "Due Date", "Alphabetical"])
     
-    # Filter tasks based on selection
-    filtered_tasks = st.session_state.tasks.copy()
-    
-    # Apply completion filter
-    if filter_option == "Active":
-        filtered_tasks = [t for t in filtered_tasks if not t['completed']]
-    elif filter_option == "Completed":
-        filtered_tasks = [t for t in filtered_tasks if t['completed']]
-    
-    # Apply priority filter
-    if show_priority and priority_filter != "All":
-        filtered_tasks = [t for t in filtered_tasks if t.get('priority') == priority_filter]
-    
-    # Apply search filter
-    if search_query:
-        filtered_tasks = [t for t in filtered_tasks if search_query.lower() in t['task'].lower()]
-    
-    # Apply sorting
-    if sort_option == "Priority (High to Low)":
-        priority_order = {"High": 0, "Medium": 1, "Low": 2, None: 3}
-        filtered_tasks.sort(key=lambda x: priority_order.get(x.get('priority'), 3))
-    elif sort_option == "Due Date":
-        filtered_tasks.sort(key=lambda x: x.get('due_date') or '9999-12-31')
-    elif sort_option == "Alphabetical":
-        filtered_tasks.sort(key=lambda x: x['task'].lower())
-    
-    if filtered_tasks:
-        for idx, task in enumerate(st.session_state.tasks):
-            if task not in filtered_tasks:
-                continue
-            
-            col1, col2, col3 = st.columns([0.5, 3, 0.5])
-            
-            with col1:
-                # Checkbox for completion
-                checked = st.checkbox("", value=task['completed'], key=f"check_{idx}", label_visibility="collapsed")
-                if checked != task['completed']:
-                    st.session_state.tasks[idx]['completed'] = checked
-                    save_tasks()
-                    st.rerun()
-            
-            with col2:
-                # Priority indicator
-                priority_emoji = ""
-                if task.get('priority') == "High":
-                    priority_emoji = "🔴"
-                elif task.get('priority') == "Medium":
-                    priority_emoji = "🟡"
-                elif task.get('priority') == "Low":
-                    priority_emoji = "🟢"
-                
-                # Display task with strikethrough if completed
-                if task['completed']:
-                    st.markdown(f"~~{priority_emoji} {task['task']}~~ ✓")
-                else:
-                    st.markdown(f"**{priority_emoji} {task['task']}**")
-                
-                # Display metadata
-                metadata = f"Created: {task['created_at']}"
-                if task.get('due_date'):
-                    due = datetime.strptime(task['due_date'], "%Y-%m-%d")
-                    if due.date() < datetime.now().date() and not task['completed']:
-                        metadata += f" | 🔴 Due: {task['due_date']} (Overdue!)"
-                    else:
-                        metadata += f" | 📅 Due: {task['due_date']}"
-                if task.get('category'):
-                    metadata += f" | 🏷️ {task['category']}"
-                
-                st.caption(metadata)
-            
-            with col3:
-                # Delete button
-                if st.button("🗑️", key=f"del_{idx}"):
-                    st.session_state.tasks.pop(idx)
-                    save_tasks()
-                    st.rerun()
-            
-            st.markdown("---")
-        
-        # Task statistics
-        total = len(st.session_state.tasks)
-        completed = sum(1 for t in st.session_state.tasks if t['completed'])
-        active = total - completed
-        
-        if show_due_date:
-            overdue = sum(1 for t in st.session_state.tasks 
-                         if t.get('due_date') and not t['completed'] 
-                         and datetime.strptime(t['due_date'], "%Y-%m-%d").date() < datetime.now().date())
-        
-        st.markdown("### 📊 Statistics")
-        
-        if show_due_date:
-            col1, col2, col3, col4 = st.columns(4)
-            col1.metric("Total Tasks", total)
-            col2.metric("Active", active)
-            col3.metric("Completed", completed)
-            col4.metric("Overdue", overdue, delta_color="inverse")
+    # Snapshot the shared list under the lock so changes from other sessions can't
+    # shift positions while the view is built; everything below reads the snapshot
+    with get_task_lock():
+        snapshot = list(tasks)
+        if sort_option in SORT_KEYS:
+            # Map the presorted ids back to positions (the list itself is in creation order)
+            position = {t['id']: i for i, t in enumerate(snapshot)}
+            order = tuple(position[task_id] for _, task_id in get_task_orders()[sort_option])
         else:
-            col1, col2, col3 = st.columns(3)
-            col1.metric("Total Tasks", total)
-            col2.metric("Active", active)
-            col3.metric("Completed", completed)
-        
-        # Progress bar
-        if total > 0:
-            progress = completed / total
-            st.progress(progress)
-            st.caption(f"Progress: {completed}/{total} tasks completed ({progress*100:.1f}%)")
-        
-        # Clear completed button
-        if completed > 0:
-            if st.button("Clear Completed Tasks", type="secondary"):
-                st.session_state.tasks = [t for t in st.session_state.tasks if not t['completed']]
-                save_tasks()
-                st.rerun()
-    else:
+            order = tuple(range(len(snapshot)))
+        completed = tuple(t['completed'] for t in snapshot)
+        priority_ranks = tuple(t['priority_rank'] for t in snapshot)
+        names = tuple(t['task_lower'] for t in snapshot)
+    
+    # Filter tasks based on selection (as positions in the snapshot)
+    filtered_indices = compute_view(
+        order,
+        completed,
+        priority_ranks,
+        names,
+        filter_option,
+        priority_filter if show_priority else "All",
+        search_query
+    )
+    
+    if not filtered_indices:
         st.info(f"No {filter_option.lower()} tasks matching your criteria.")
-else:
-    st.info("No tasks yet. Add your first task above! 🎯")
+        return
+    
+    if table_view:
+        shown = [snapshot[i] for i in filtered_indices]
+        frame = build_task_frame(
+            tuple(t['id'] for t in shown),
+            tuple(t['completed'] for t in shown),
+            tuple(t['task'] for t in shown),
+            tuple(t.get('priority') for t in shown),
+            tuple(t.get('due_date') for t in shown),
+            tuple(t.get('category') for t in shown)
+        )
+        edited = st.data_editor(
+            frame,
+            column_config={
+                'Done': st.column_config.CheckboxColumn("Done", width="small"),
+                'Task': st.column_config.TextColumn("Task", width="large"),
+                'Priority': st.column_config.TextColumn("Priority") if show_priority else None,
+                'Due': st.column_config.TextColumn("Due Date") if show_due_date else None,
+                'Category': st.column_config.TextColumn("Category") if show_categories else None
+            },
+            disabled=['Task', 'Priority', 'Due', 'Category'],
+            hide_index=True,
+            num_rows="delete",
+            use_container_width=True
+        )
+        apply_table_edits(frame, edited)
+    else:
+        for idx in filtered_indices:
+            render_task_row(idx, snapshot[idx]['id'], today_ord)
+    
+    render_stats(show_due_date)
+
+# App title
+st.title("✅ My To-Do List")
+st.markdown("*Stay organized and productive!*")
+st.markdown("---")
+
+# Sidebar for additional features (settings stay outside fragments: every section reads them)
+with st.sidebar:
+    st.header("⚙️ Settings")
+    
+    # Priority levels
+    show_priority = st.checkbox("Enable Priority Levels", value=False)
+    
+    # Due dates
+    show_due_date = st.checkbox("Enable Due Dates", value=False)
+    
+    # Categories
+    show_categories = st.checkbox("Enable Categories", value=False)
+    
+    # Table view (one widget for the whole list instead of one row per task)
+    table_view = st.checkbox("Table View", value=False)
+    
+    st.markdown("---")
+    st.header("📥 Import/Export")
+    
+    # Export tasks
+    render_export()
+    
+    # Clear all tasks
+    st.markdown("---")
+    if st.button("🗑️ Clear All Tasks", type="secondary", use_container_width=True):
+        if st.session_state.tasks:
+            with get_task_lock():
+                st.session_state.tasks.clear()
+                recount_tasks(today_ord)
+                get_task_orders().update(build_task_orders([]))
+            mark_dirty()
+            st.rerun()
+
+render_add_form(show_priority, show_due_date, show_categories)
+
+st.markdown("---")
+
+# Display tasks
+render_task_list(show_priority, show_due_date, show_categories, table_view, today_ord)
 
 # Footer
 st.markdown("---")